@@ -0,0 +1,77 @@
+import os
+import time
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+
+# -----------------------------
+# Configuración
+# -----------------------------
+
+# TTL acota la desactualización entre procesos (cada worker tiene su caché)
+HTML_CACHE_TTL = int(os.getenv("HTML_CACHE_TTL", 30))
+HTML_CACHE_MAX_ENTRIES = int(os.getenv("HTML_CACHE_MAX_ENTRIES", 256))
+
+
+# -----------------------------
+# Caché de páginas renderizadas
+# -----------------------------
+
+class RenderedPageCache:
+    """
+    Caché en memoria de HTML renderizado, indexada por versión de datos y página.
+    Cualquier alta o cancelación incrementa la versión y descarta lo cacheado.
+    """
+
+    def __init__(self, ttl: int = HTML_CACHE_TTL, max_entries: int = HTML_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._version = 0
+        self._entries: Dict[Tuple, Tuple[float, str, str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: Tuple) -> Optional[Tuple[str, str]]:
+        """Devuelve (html, etag) si hay una entrada vigente para la versión actual."""
+        with self._lock:
+            entry = self._entries.get((self._version, *key))
+
+            if entry is None:
+                return None
+
+            stored_at, html, etag = entry
+            if time.monotonic() - stored_at > self.ttl:
+                self._entries.pop((self._version, *key), None)
+                return None
+
+            return html, etag
+
+    def set(self, version: int, key: Tuple, html: str) -> str:
+        """
+        Guarda el HTML renderizado con la versión leída ANTES de consultar la DB.
+        Si hubo una invalidación en el medio, la entrada queda huérfana y no se sirve.
+        """
+        etag = hashlib.sha1(html.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            if version != self._version:
+                return etag
+
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+
+            self._entries[(version, *key)] = (time.monotonic(), html, etag)
+
+        return etag
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+appointments_page_cache = RenderedPageCache()
@@ -10,6 +10,8 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 
+from app.pool_monitor import InstrumentedQueuePool, PoolMonitor
+
 # Logger (configurado a nivel aplicación, no aquí)
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,10 @@ def validate_database_url(url: str) -> bool:
     return bool(parsed.scheme and parsed.path)
 
 
+def _is_sqlite_memory(url: str) -> bool:
+    return ":memory:" in url or "mode=memory" in url
+
+
 # -----------------------------
 # Engine factory
 # -----------------------------
@@ -43,6 +49,9 @@ def get_engine(
 
     if database_url.startswith("sqlite"):
         engine_kwargs["connect_args"] = {"check_same_thread": False}
+        # SQLite en archivo ya usa QueuePool; en memoria requiere SingletonThreadPool
+        if not async_mode and not _is_sqlite_memory(database_url):
+            engine_kwargs["poolclass"] = InstrumentedQueuePool
     else:
         pool_config = pool_config or {}
         engine_kwargs.update({
@@ -51,6 +60,9 @@ def get_engine(
             "pool_timeout": pool_config.get("pool_timeout", 30),
             "pool_recycle": pool_config.get("pool_recycle", 1800),
         })
+        # El pool async requiere su propia clase adaptada
+        if not async_mode:
+            engine_kwargs["poolclass"] = InstrumentedQueuePool
 
     try:
         engine = (
@@ -78,12 +90,24 @@ POOL_CONFIG = {
     "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
 }
 
+# Modo adaptativo: off | recommend | apply
+ADAPTIVE_POOL_CONFIG = {
+    "adaptive": os.getenv("DB_POOL_ADAPTIVE", "off"),
+    "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 1)),
+    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 0)) or None,
+    "target_wait_ms": float(os.getenv("DB_POOL_TARGET_WAIT_MS", 50)),
+    "interval": float(os.getenv("DB_POOL_ADAPT_INTERVAL", 60)),
+}
+
 engine = get_engine(
     DATABASE_URL,
     async_mode=False,
     pool_config=POOL_CONFIG,
 )
 
+# Observabilidad del pool (eventos de SQLAlchemy)
+pool_monitor = PoolMonitor(**ADAPTIVE_POOL_CONFIG).attach(engine)
+
 # Session factory (una sesión por request)
 SessionLocal = sessionmaker(
     autocommit=False,
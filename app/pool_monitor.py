@@ -0,0 +1,383 @@
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+WAIT_SAMPLE_SIZE = 1000
+MIN_SAMPLES_TO_ADAPT = 50
+
+ADAPTIVE_MODES = ("off", "recommend", "apply")
+
+
+# -----------------------------
+# Pool instrumentado
+# -----------------------------
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mide la espera de cada checkout (incluye pool_timeout),
+    separada del tiempo de abrir conexiones nuevas, y permite redimensionarse en caliente.
+
+    Los eventos del pool no exponen la espera, así que esta clase usa internos
+    de QueuePool (_do_get, _create_connection, _overflow, _overflow_lock,
+    _max_overflow, _pool.maxsize) verificados contra SQLAlchemy==2.0.30.
+    tests/test_pool_monitor.py falla si dejan de existir.
+    """
+
+    monitor: Optional["PoolMonitor"] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._timing = threading.local()
+
+    def _do_get(self):
+        # QueuePool._do_get puede reintentar recursivamente: medir solo la llamada externa
+        if getattr(self._timing, "active", False):
+            return super()._do_get()
+
+        self._timing.active = True
+        self._timing.connect = 0.0
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            if self.monitor is not None:
+                self.monitor.record_timeout(time.perf_counter() - start)
+            raise
+        finally:
+            self._timing.active = False
+
+        # Abrir una conexión (nueva u overflow) no es esperar en la cola
+        if self.monitor is not None:
+            self.monitor.record_wait(time.perf_counter() - start - self._timing.connect)
+        return record
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            elapsed = time.perf_counter() - start
+            self._timing.connect = getattr(self._timing, "connect", 0.0) + elapsed
+            if self.monitor is not None:
+                self.monitor.record_connect(elapsed)
+
+    def recreate(self):
+        # engine.dispose() recrea el pool: conservar el monitor
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
+
+    def max_connections(self) -> int | None:
+        """Límite total de conexiones abiertas (None si el overflow es ilimitado)."""
+        if self._max_overflow < 0:
+            return None
+        return self._pool.maxsize + self._max_overflow
+
+    def resize(self, pool_size: int, max_connections: int | None = None) -> None:
+        """
+        Cambia pool_size manteniendo la cuenta de overflow
+        (overflow = conexiones totales - pool_size).
+        max_overflow se ajusta para que pool_size + max_overflow no supere
+        max_connections (por defecto, el límite total actual).
+        """
+        with self._overflow_lock:
+            if max_connections is None:
+                max_connections = self.max_connections()
+
+            delta = pool_size - self._pool.maxsize
+            self._pool.maxsize = pool_size
+            self._overflow -= delta
+
+            if max_connections is not None:
+                self._max_overflow = max(max_connections - pool_size, 0)
+
+
+# -----------------------------
+# Monitor
+# -----------------------------
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class PoolMonitor:
+    """
+    Métricas del pool a partir de los eventos de SQLAlchemy:
+    checkouts, checkins, conexiones en uso, overflow, esperas y timeouts.
+    En modo adaptativo recomienda (o aplica) un pool_size según el p95 de espera.
+    """
+
+    def __init__(
+        self,
+        adaptive: str = "off",
+        min_size: int = 1,
+        max_size: Optional[int] = None,
+        target_wait_ms: float = 50.0,
+        interval: float = 60.0,
+    ):
+        if adaptive not in ADAPTIVE_MODES:
+            raise ValueError(f"Modo adaptativo inválido: {adaptive}")
+
+        self.adaptive = adaptive
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_wait_ms = target_wait_ms
+        self.interval = interval
+
+        self._engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+        self._excluded = threading.local()
+        self._waits: deque = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._connect_times: deque = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._ceiling: Optional[int] = max_size
+
+        # Ventana de observación del modo adaptativo (se reinicia en cada evaluación)
+        self._window_waits: deque = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._window_timeouts = 0
+        self._window_peak = 0
+        self._last_evaluation = time.monotonic()
+        self.last_recommendation: Optional[Dict[str, Any]] = None
+
+    # ---------- Registro ----------
+
+    def attach(self, engine) -> "PoolMonitor":
+        engine = getattr(engine, "sync_engine", engine)
+        self._engine = engine
+
+        pool = engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.monitor = self
+            # Techo fijo de conexiones totales (pool_size + max_overflow):
+            # no debe crecer junto con el pool al redimensionar
+            if self._ceiling is None and pool.size() > 0:
+                self._ceiling = pool.max_connections()
+        elif self.adaptive != "off":
+            logger.warning(
+                f"DB_POOL_ADAPTIVE={self.adaptive} ignorado: "
+                f"{type(pool).__name__} no admite medición de espera"
+            )
+
+        # Los listeners del pool sobreviven a recreate()/dispose()
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "invalidate", self._on_invalidate)
+        return self
+
+    @property
+    def pool(self) -> Optional[Pool]:
+        return self._engine.pool if self._engine is not None else None
+
+    # ---------- Eventos ----------
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self._window_peak = max(self._window_peak, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+
+        if self.adaptive != "off":
+            self._maybe_adapt()
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    @contextmanager
+    def excluded(self):
+        """
+        Excluye de las muestras de espera los checkouts del bloque
+        (p. ej. el health check, que sesgaría el p95 hacia "oversized").
+        """
+        self._excluded.active = True
+        try:
+            yield
+        finally:
+            self._excluded.active = False
+
+    def record_wait(self, seconds: float) -> None:
+        if getattr(self._excluded, "active", False):
+            return
+        with self._lock:
+            self._waits.append(seconds)
+            self._window_waits.append(seconds)
+
+    def record_timeout(self, seconds: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self._window_timeouts += 1
+            self._waits.append(seconds)
+            self._window_waits.append(seconds)
+
+    def record_connect(self, seconds: float) -> None:
+        with self._lock:
+            self._connect_times.append(seconds)
+
+    # ---------- Métricas ----------
+
+    @staticmethod
+    def _timing_stats(samples) -> Dict[str, Any]:
+        waits = sorted(samples)
+        return {
+            "samples": len(waits),
+            "p50": round(_percentile(waits, 50) * 1000, 3),
+            "p95": round(_percentile(waits, 95) * 1000, 3),
+            "p99": round(_percentile(waits, 99) * 1000, 3),
+            "max": round((waits[-1] if waits else 0.0) * 1000, 3),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.pool
+
+        with self._lock:
+            data: Dict[str, Any] = {
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "totals": {
+                    "checkouts": self.checkouts,
+                    "checkins": self.checkins,
+                    "connects": self.connects,
+                    "invalidations": self.invalidations,
+                    "timeouts": self.timeouts,
+                },
+                "wait_ms": self._timing_stats(self._waits),
+                "connect_ms": self._timing_stats(self._connect_times),
+                "adaptive": {
+                    "mode": self.adaptive,
+                    "recommendation": self.last_recommendation,
+                },
+            }
+
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+                "max_connections": (
+                    pool.max_connections()
+                    if isinstance(pool, InstrumentedQueuePool)
+                    else pool.size() + max(pool._max_overflow, 0)
+                ),
+                "timeout": pool.timeout(),
+                "adaptive_ceiling": self._ceiling,
+            })
+
+        return data
+
+    # ---------- Modo adaptativo ----------
+
+    def recommend(self) -> Optional[Dict[str, Any]]:
+        """
+        Propone un pool_size a partir de la ventana actual:
+        - crece si el p95 de espera supera el objetivo o hubo timeouts
+        - se achica si casi no hay espera y el pico de uso quedó por debajo del tamaño
+        """
+        pool = self.pool
+        if not isinstance(pool, QueuePool) or pool.size() == 0:
+            return None
+
+        size = pool.size()
+        # El techo limita conexiones totales; sin él no se crece
+        max_size = max(self._ceiling or size, size)
+        step = max(1, size // 4)
+
+        with self._lock:
+            p95_ms = _percentile(sorted(self._window_waits), 95) * 1000
+            window_timeouts = self._window_timeouts
+            window_peak = self._window_peak
+
+        if window_timeouts or p95_ms > self.target_wait_ms:
+            recommended = min(max_size, size + step)
+            reason = "wait_above_target"
+        elif p95_ms < self.target_wait_ms / 10 and window_peak < size:
+            recommended = max(self.min_size, window_peak, size - step)
+            reason = "oversized"
+        else:
+            recommended = size
+            reason = "ok"
+
+        return {
+            "current_size": size,
+            "recommended_size": recommended,
+            "reason": reason,
+            "max_size": max_size,
+            "p95_wait_ms": round(p95_ms, 3),
+            "window_timeouts": window_timeouts,
+            "window_peak_in_use": window_peak,
+        }
+
+    def _maybe_adapt(self) -> None:
+        now = time.monotonic()
+
+        with self._lock:
+            if now - self._last_evaluation < self.interval:
+                return
+            self._last_evaluation = now
+
+            # Sin datos suficientes no se decide: se descarta la ventana
+            if len(self._window_waits) < MIN_SAMPLES_TO_ADAPT and not self._window_timeouts:
+                self._reset_window()
+                return
+
+        self.evaluate()
+
+    def evaluate(self) -> Optional[Dict[str, Any]]:
+        recommendation = self.recommend()
+        if recommendation is None:
+            return None
+
+        pool = self.pool
+        changed = recommendation["recommended_size"] != recommendation["current_size"]
+
+        if changed and self.adaptive == "apply" and isinstance(pool, InstrumentedQueuePool):
+            pool.resize(recommendation["recommended_size"], max_connections=self._ceiling)
+            logger.info(
+                f"Pool redimensionado {recommendation['current_size']} -> "
+                f"{recommendation['recommended_size']} ({recommendation['reason']})"
+            )
+
+        with self._lock:
+            self.last_recommendation = recommendation
+            self._reset_window()
+
+        return recommendation
+
+    def _reset_window(self) -> None:
+        # Llamar con self._lock tomado
+        self._window_waits.clear()
+        self._window_timeouts = 0
+        self._window_peak = self.in_use
@@ -8,19 +8,28 @@ from flask import (
     redirect,
     url_for,
     flash,
+    session,
+    make_response,
 )
 from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
-from app.database import get_db
+from app.cache import appointments_page_cache
+from app.database import get_db, pool_monitor
 from app.schemas import AppointmentCreate
 from app.services import (
     list_appointments,
+    count_appointments,
     create_appointment,
     cancel_appointment,
 )
 
 routes = Blueprint("routes", __name__)
 
+HTML_PAGE_SIZE = 10
+HTML_MAX_PAGE_SIZE = 100
+
 # -----------------------------
 # API REST
 # -----------------------------
@@ -88,19 +97,96 @@ def cancel(appointment_id: int):
         return jsonify({"error": "Datos inválidos"}), 400
 
 
+@routes.route("/health/db", methods=["GET"])
+def db_health():
+    try:
+        # El checkout del probe no debe alimentar las muestras de espera
+        with pool_monitor.excluded(), get_db() as db:
+            db.execute(text("SELECT 1"))
+        status, status_code = "ok", 200
+    except SQLAlchemyError:
+        status, status_code = "unavailable", 503
+
+    return jsonify({
+        "status": status,
+        "pool": pool_monitor.snapshot(),
+    }), status_code
+
+
 # -----------------------------
 # Vistas HTML
 # -----------------------------
 
 @routes.route("/")
 def show_appointments():
+    page = max(request.args.get("page", default=1, type=int), 1)
+    page_size = request.args.get("page_size", default=HTML_PAGE_SIZE, type=int)
+    page_size = min(max(page_size, 1), HTML_MAX_PAGE_SIZE)
+
+    # Con mensajes flash pendientes la página no es reutilizable: render sin caché
+    if _has_pending_flashes():
+        html, last_page = _render_appointments_page(page, page_size)
+        return html if html is not None else _redirect_to_page(last_page, page_size)
+
+    # Solo se cachean páginas existentes: las fuera de rango redirigen sin ocupar entradas
+    cache_key = (page, page_size)
+    cached = appointments_page_cache.get(cache_key)
+
+    if cached is not None:
+        html, etag = cached
+    else:
+        # La versión se lee ANTES de la consulta para no cachear datos viejos
+        version = appointments_page_cache.version
+        html, last_page = _render_appointments_page(page, page_size)
+
+        if html is None:
+            return _redirect_to_page(last_page, page_size)
+
+        etag = appointments_page_cache.set(version, cache_key, html)
+
+    response = make_response(html)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
+
+
+def _has_pending_flashes() -> bool:
+    # Flask guarda los flash pendientes en la clave privada "_flashes" de la sesión;
+    # leerlos con get_flashed_messages() los consumiría antes del render.
+    return bool(session.get("_flashes"))
+
+
+def _redirect_to_page(page: int, page_size: int):
+    return redirect(url_for("routes.show_appointments", page=page, page_size=page_size))
+
+
+def _render_appointments_page(page: int, page_size: int) -> tuple[str | None, int]:
+    """
+    Devuelve (html, última página).
+    Si la página pedida no existe no se consulta ni renderiza nada: html es None.
+    """
     with get_db() as db:
-        appointments, _ = list_appointments(db)
+        total = count_appointments(db)
+        total_pages = max((total + page_size - 1) // page_size, 1)
 
-    return render_template(
+        if page > total_pages:
+            return None, total_pages
+
+        appointments, total = list_appointments(
+            db,
+            page=page,
+            page_size=page_size,
+        )
+
+    html = render_template(
         "appointments.html",
         appointments=appointments,
+        page=page,
+        page_size=page_size,
+        total=total,
+        total_pages=total_pages,
     )
+    return html, total_pages
 
 
 @routes.route("/appointments/new", methods=["GET", "POST"])
@@ -1,6 +1,17 @@
 import re
+import json
+from pathlib import Path
 from datetime import datetime, time, timezone, timedelta
-from pydantic import BaseModel, field_validator
+from typing import Annotated, Any, Dict, Iterable, List, Tuple
+
+from pydantic import (
+    BaseModel,
+    TypeAdapter,
+    ValidationError,
+    ValidationInfo,
+    WrapValidator,
+    field_validator,
+)
 
 
 BUSINESS_HOURS_START = time(9, 0)
@@ -11,42 +22,177 @@ MIN_ADVANCE_MINUTES = 5
 
 ARGENTINA_TZ = timezone(timedelta(hours=-3))
 
+# ✔️ Letras (incluye acentos) + números + espacios (compilado una sola vez)
+USER_NAME_PATTERN = re.compile(r"[A-Za-zÀ-ÿ0-9\s]+")
 
-class AppointmentCreate(BaseModel):
-    user_name: str
-    appointment_time: datetime
 
-    @field_validator("user_name")
-    def validate_user_name(cls, value: str) -> str:
-        normalized = value.strip()
+# -----------------------------
+# Reglas compartidas
+# -----------------------------
 
-        if not normalized:
-            raise ValueError("Datos inválidos")
+def _min_allowed(now_utc: datetime) -> datetime:
+    """Primer horario reservable a partir de "ahora"."""
+    return now_utc + timedelta(minutes=MIN_ADVANCE_MINUTES)
 
-        if len(normalized) > MAX_USERNAME_LENGTH:
-            raise ValueError("Datos inválidos")
 
-        # ✔️ Letras (incluye acentos) + números + espacios
-        if not re.fullmatch(r"[A-Za-zÀ-ÿ0-9\s]+", normalized):
-            raise ValueError("Datos inválidos")
+def _reference_min_allowed(info: ValidationInfo) -> datetime:
+    """
+    Devuelve el primer horario reservable a partir del "ahora" de referencia.
+    En validaciones por lote se calcula una vez y se comparte vía context.
+    """
+    context = info.context or {}
+    if "min_allowed" in context:
+        return context["min_allowed"]
+    return _min_allowed(context.get("now") or datetime.now(timezone.utc))
 
-        return normalized
 
-    @field_validator("appointment_time")
-    def validate_appointment_time(cls, value: datetime) -> datetime:
-        if value.tzinfo is None:
-            raise ValueError("Datos inválidos")
+def normalize_user_name(value: str) -> str:
+    normalized = value.strip()
+
+    if not normalized:
+        raise ValueError("Datos inválidos")
+
+    if len(normalized) > MAX_USERNAME_LENGTH:
+        raise ValueError("Datos inválidos")
+
+    if not USER_NAME_PATTERN.fullmatch(normalized):
+        raise ValueError("Datos inválidos")
+
+    return normalized
+
 
-        now_utc = datetime.now(timezone.utc)
-        min_allowed = now_utc + timedelta(minutes=MIN_ADVANCE_MINUTES)
+def is_within_business_hours(value: datetime) -> bool:
+    local_time = value.astimezone(ARGENTINA_TZ).time()
+    return BUSINESS_HOURS_START <= local_time <= BUSINESS_HOURS_END
 
-        if value < min_allowed:
-            raise ValueError("Datos inválidos")
 
-        local_dt = value.astimezone(ARGENTINA_TZ)
-        local_time = local_dt.time()
+def check_appointment_time(value: datetime, min_allowed: datetime) -> datetime:
+    if value.tzinfo is None:
+        raise ValueError("Datos inválidos")
 
-        if not (BUSINESS_HOURS_START <= local_time <= BUSINESS_HOURS_END):
-            raise ValueError("Datos inválidos")
+    if value < min_allowed:
+        raise ValueError("Datos inválidos")
 
-        return value
+    if not is_within_business_hours(value):
+        raise ValueError("Datos inválidos")
+
+    return value
+
+
+# -----------------------------
+# Schemas
+# -----------------------------
+
+class AppointmentCreate(BaseModel):
+    user_name: str
+    appointment_time: datetime
+
+    @field_validator("user_name")
+    def validate_user_name(cls, value: str) -> str:
+        return normalize_user_name(value)
+
+    @field_validator("appointment_time")
+    def validate_appointment_time(cls, value: datetime, info: ValidationInfo) -> datetime:
+        return check_appointment_time(value, _reference_min_allowed(info))
+
+
+# -----------------------------
+# Validación por lote
+# -----------------------------
+
+def _row_errors(error: ValidationError) -> List[Dict[str, Any]]:
+    """Errores serializables a JSON (sin ctx ni input)."""
+    return [
+        {"loc": list(e["loc"]), "msg": e["msg"], "type": e["type"]}
+        for e in error.errors(include_url=False)
+    ]
+
+
+def _capture_row_error(value: Any, handler) -> AppointmentCreate | ValidationError:
+    # Una fila inválida no aborta el lote: se devuelve su error en su posición
+    try:
+        return handler(value)
+    except ValidationError as e:
+        return e
+
+
+# Una sola pasada de pydantic-core para todo el lote, con los mismos validators
+_BATCH_ADAPTER = TypeAdapter(
+    List[Annotated[AppointmentCreate, WrapValidator(_capture_row_error)]]
+)
+
+
+def validate_appointments_batch(
+    payloads: Iterable[Dict[str, Any]],
+    now: datetime | None = None,
+) -> Tuple[List[Tuple[int, AppointmentCreate]], List[Dict[str, Any]]]:
+    """
+    Valida muchos payloads con un único "ahora" de referencia.
+    Devuelve (fila, turno) para los válidos y los errores por fila (índice 0-based).
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    elif now.tzinfo is None:
+        raise ValueError("now debe incluir zona horaria")
+
+    results = _BATCH_ADAPTER.validate_python(
+        list(payloads),
+        context={"min_allowed": _min_allowed(now)},
+    )
+
+    valid: List[Tuple[int, AppointmentCreate]] = []
+    errors: List[Dict[str, Any]] = []
+
+    for row, result in enumerate(results):
+        if isinstance(result, ValidationError):
+            errors.append({"row": row, "errors": _row_errors(result)})
+        else:
+            valid.append((row, result))
+
+    return valid, errors
+
+
+def validate_appointments_jsonl(
+    path: str | Path,
+    now: datetime | None = None,
+) -> Tuple[List[Tuple[int, AppointmentCreate]], List[Dict[str, Any]]]:
+    """
+    Valida un archivo JSONL (un payload por línea).
+    Las filas devueltas son números de línea 0-based del archivo.
+    Las líneas vacías se ignoran; las que no son UTF-8 o JSON válido se reportan como error.
+    """
+    payloads: List[Dict[str, Any]] = []
+    rows: List[int] = []
+    parse_errors: List[Dict[str, Any]] = []
+
+    with open(path, "rb") as f:
+        for row, raw_line in enumerate(f):
+            try:
+                line = raw_line.decode("utf-8")
+            except UnicodeDecodeError as e:
+                parse_errors.append({
+                    "row": row,
+                    "errors": [{"loc": [], "msg": e.reason, "type": "unicode_decode_error"}],
+                })
+                continue
+
+            if not line.strip():
+                continue
+            try:
+                payloads.append(json.loads(line))
+                rows.append(row)
+            except json.JSONDecodeError as e:
+                parse_errors.append({
+                    "row": row,
+                    "errors": [{"loc": [], "msg": e.msg, "type": "json_invalid"}],
+                })
+
+    valid, errors = validate_appointments_batch(payloads, now=now)
+
+    # Re-mapear índices del lote a líneas del archivo
+    valid = [(rows[index], appointment) for index, appointment in valid]
+    for error in errors:
+        error["row"] = rows[error["row"]]
+
+    errors = sorted(parse_errors + errors, key=lambda e: e["row"])
+    return valid, errors
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
+from app.cache import appointments_page_cache
 from app.models import Appointment
 from app.exceptions import (
     AppointmentAlreadyExists,
@@ -48,10 +49,25 @@ def create_appointment(db: Session, data):
             "El usuario ya tiene un turno en ese horario"
         )
 
+    appointments_page_cache.invalidate()
+
     db.refresh(appointment)
     return appointment
 
 
+def count_appointments(db: Session, status: str | None = None) -> int:
+    """
+    Devuelve la cantidad de turnos (opcionalmente filtrados por estado).
+    """
+
+    query = db.query(Appointment)
+
+    if status is not None:
+        query = query.filter(Appointment.status == status)
+
+    return query.count()
+
+
 def list_appointments(
     db: Session,
     status: str | None = None,
@@ -71,7 +87,7 @@ def list_appointments(
 
     appointments = (
         query
-        .order_by(Appointment.appointment_time)
+        .order_by(Appointment.appointment_time, Appointment.id)
         .offset((page - 1) * page_size)
         .limit(page_size)
         .all()
@@ -102,4 +118,6 @@ def cancel_appointment(db: Session, appointment_id: int):
     appointment.status = "cancelled"
     db.commit()
 
+    appointments_page_cache.invalidate()
+
     return appointment
@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# Base de datos aislada: debe configurarse antes de importar app.database
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["APP_ENV"] = "development"
@@ -0,0 +1,191 @@
+import time
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.pool_monitor import InstrumentedQueuePool, PoolMonitor
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "pool.db")
+
+
+def _engine(db_path, **kwargs):
+    kwargs.setdefault("pool_size", 2)
+    kwargs.setdefault("max_overflow", 1)
+    kwargs.setdefault("pool_timeout", 0.05)
+    return create_engine(
+        f"sqlite:///{db_path}",
+        poolclass=InstrumentedQueuePool,
+        connect_args={"check_same_thread": False},
+        **kwargs,
+    )
+
+
+def _open_until_timeout(engine):
+    held = []
+    with pytest.raises(PoolTimeoutError):
+        while True:
+            held.append(engine.raw_connection())
+    return held
+
+
+def test_queuepool_internals_available():
+    # InstrumentedQueuePool depende de internos de QueuePool (SQLAlchemy==2.0.30)
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=2, max_overflow=1)
+
+    for name in ("_do_get", "_create_connection", "_overflow_lock", "_overflow", "_max_overflow", "_pool"):
+        assert hasattr(pool, name), f"QueuePool.{name} ya no existe"
+    assert pool._pool.maxsize == 2
+    assert pool._overflow == -2
+    assert pool._max_overflow == 1
+
+
+def test_resize_keeps_overflow_accounting(db_path):
+    engine = _engine(db_path)
+    pool = engine.pool
+    held = [engine.raw_connection() for _ in range(2)]
+
+    # Crecer convierte overflow en conexiones persistentes: el total sigue en 3
+    pool.resize(3)
+    assert pool.size() == 3
+    assert pool.max_connections() == 3
+    assert pool.checkedout() == 2
+
+    held += _open_until_timeout(engine)
+    assert len(held) == 3
+    assert pool.checkedout() == 3
+
+    # Achicar con conexiones en uso: las sobrantes se cierran al devolverse
+    pool.resize(1)
+    assert pool.max_connections() == 3
+    assert pool.checkedout() == 3
+    for connection in held:
+        connection.close()
+
+    assert pool.checkedout() == 0
+    assert pool.checkedin() == 1
+    assert pool.overflow() == 0
+
+
+def test_recreate_keeps_monitor(db_path):
+    engine = _engine(db_path)
+    monitor = PoolMonitor().attach(engine)
+
+    engine.dispose()
+    assert engine.pool.monitor is monitor
+
+    engine.raw_connection().close()
+    assert monitor.checkouts == 1
+    assert monitor.snapshot()["wait_ms"]["samples"] == 1
+
+
+def test_timeout_is_recorded(db_path):
+    engine = _engine(db_path, pool_size=1, max_overflow=0)
+    monitor = PoolMonitor().attach(engine)
+    held = engine.raw_connection()
+
+    with pytest.raises(PoolTimeoutError):
+        engine.raw_connection()
+
+    held.close()
+    snapshot = monitor.snapshot()
+    assert snapshot["totals"]["timeouts"] == 1
+    assert snapshot["wait_ms"]["max"] >= 40
+
+
+def test_connect_time_is_not_wait_time(db_path):
+    def slow_connect():
+        time.sleep(0.1)
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    engine = create_engine("sqlite://", creator=slow_connect, poolclass=InstrumentedQueuePool)
+    monitor = PoolMonitor().attach(engine)
+
+    engine.raw_connection().close()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["connect_ms"]["max"] >= 100
+    assert snapshot["wait_ms"]["max"] < 50
+
+
+def _feed(monitor, seconds, count=10):
+    for _ in range(count):
+        monitor.record_wait(seconds)
+
+
+def test_recommend_thresholds(db_path):
+    engine = _engine(db_path, pool_size=4, max_overflow=2)
+    monitor = PoolMonitor(adaptive="recommend", min_size=2, target_wait_ms=50).attach(engine)
+
+    _feed(monitor, 0.2)
+    assert monitor.evaluate()["reason"] == "wait_above_target"
+    assert monitor.last_recommendation["recommended_size"] == 5
+    # "recommend" no modifica el pool
+    assert engine.pool.size() == 4
+
+    # Ventana nueva: las esperas altas anteriores no cuentan
+    _feed(monitor, 0.0)
+    recommendation = monitor.evaluate()
+    assert recommendation["reason"] == "oversized"
+    assert recommendation["recommended_size"] == 3
+
+    _feed(monitor, 0.02)
+    assert monitor.evaluate()["reason"] == "ok"
+
+
+def test_apply_growth_stops_at_ceiling(db_path):
+    engine = _engine(db_path, pool_size=5, max_overflow=10)
+    monitor = PoolMonitor(adaptive="apply").attach(engine)
+
+    for _ in range(30):
+        _feed(monitor, 0.2)
+        monitor.evaluate()
+
+    assert engine.pool.size() == 15
+    assert monitor.snapshot()["max_connections"] == 15
+
+    # El overflow no se suma encima del pool crecido
+    held = _open_until_timeout(engine)
+    assert len(held) <= 15
+    for connection in held:
+        connection.close()
+
+
+def test_apply_respects_explicit_max_size(db_path):
+    engine = _engine(db_path, pool_size=2, max_overflow=10)
+    monitor = PoolMonitor(adaptive="apply", max_size=4).attach(engine)
+
+    for _ in range(10):
+        _feed(monitor, 0.2)
+        monitor.evaluate()
+
+    assert engine.pool.size() == 4
+    assert len(_open_until_timeout(engine)) == 4
+
+
+def test_excluded_checkouts_are_not_sampled(db_path):
+    engine = _engine(db_path)
+    monitor = PoolMonitor().attach(engine)
+
+    with monitor.excluded():
+        engine.raw_connection().close()
+    engine.raw_connection().close()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["totals"]["checkouts"] == 2
+    assert snapshot["wait_ms"]["samples"] == 1
+
+
+def test_apply_respects_min_size(db_path):
+    engine = _engine(db_path, pool_size=4, max_overflow=0)
+    monitor = PoolMonitor(adaptive="apply", min_size=3).attach(engine)
+
+    for _ in range(5):
+        _feed(monitor, 0.0)
+        monitor.evaluate()
+
+    assert engine.pool.size() == 3
@@ -0,0 +1,92 @@
+import pytest
+
+from app.cache import appointments_page_cache
+from app.main import create_app
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def _create(client, hour=15):
+    response = client.post("/appointments", json={
+        "user_name": "Juan Perez",
+        "appointment_time": f"2030-01-10T{hour}:00:00+00:00",
+    })
+    assert response.status_code == 201
+    return response.get_json()["id"]
+
+
+def test_index_sends_etag_and_revalidates(client):
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    etag = response.headers["ETag"]
+
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_create_and_cancel_invalidate_cache(client):
+    etag = client.get("/").headers["ETag"]
+
+    version = appointments_page_cache.version
+    appointment_id = _create(client, hour=16)
+    assert appointments_page_cache.version == version + 1
+
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    version = appointments_page_cache.version
+    response = client.post(f"/appointments/{appointment_id}/cancel")
+    assert response.status_code == 302
+    assert appointments_page_cache.version == version + 1
+
+    # Consumir el flash de la cancelación
+    client.get("/")
+
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_page_with_flash_is_not_cached(client):
+    with client.session_transaction() as session:
+        session["_flashes"] = [("info", "Turno cancelado correctamente")]
+
+    response = client.get("/")
+    assert "ETag" not in response.headers
+    assert "Turno cancelado correctamente" in response.get_data(as_text=True)
+
+    response = client.get("/")
+    assert "Turno cancelado correctamente" not in response.get_data(as_text=True)
+
+
+def test_db_health_reports_instrumented_pool(client):
+    client.get("/appointments")
+
+    response = client.get("/health/db")
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["status"] == "ok"
+    assert data["pool"]["pool_class"] == "InstrumentedQueuePool"
+    assert data["pool"]["wait_ms"]["samples"] > 0
+
+    # El propio probe no suma muestras de espera
+    samples = data["pool"]["wait_ms"]["samples"]
+    assert client.get("/health/db").get_json()["pool"]["wait_ms"]["samples"] == samples
+
+
+def test_page_past_the_end_redirects_to_last_page(client):
+    for page in ("999", "100000000000000000000"):
+        response = client.get(f"/?page={page}&page_size=100")
+
+        assert response.status_code == 302
+        assert "page=1" in response.headers["Location"]
+        assert appointments_page_cache.get((int(page), 100)) is None
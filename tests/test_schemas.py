@@ -0,0 +1,107 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.schemas import (
+    AppointmentCreate,
+    validate_appointments_batch,
+    validate_appointments_jsonl,
+)
+
+# 12:00 UTC = 09:00 Argentina
+NOW = datetime(2030, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _payload(user_name="Juan Perez", appointment_time="2030-01-10T15:00:00+00:00"):
+    return {"user_name": user_name, "appointment_time": appointment_time}
+
+
+def test_batch_uses_shared_now():
+    valid, errors = validate_appointments_batch([_payload()], now=NOW)
+
+    assert errors == []
+    assert valid[0][1].appointment_time == datetime(2030, 1, 10, 15, 0, tzinfo=timezone.utc)
+
+    # Pasado respecto al reloj real, futuro respecto al "ahora" compartido
+    valid, errors = validate_appointments_batch(
+        [_payload(appointment_time="2020-01-10T15:00:00+00:00")],
+        now=datetime(2020, 1, 10, 12, 0, tzinfo=timezone.utc),
+    )
+    assert errors == [] and len(valid) == 1
+
+    # Menos de MIN_ADVANCE_MINUTES respecto al "ahora" compartido
+    _, errors = validate_appointments_batch(
+        [_payload(appointment_time="2030-01-10T12:02:00+00:00")],
+        now=NOW,
+    )
+    assert errors[0]["row"] == 0
+
+
+def test_batch_reports_row_indices_and_json_serializable_errors():
+    payloads = [
+        _payload(),
+        _payload(user_name="   "),
+        _payload(appointment_time="2030-01-10T23:00:00+00:00"),  # 20:00 local
+        _payload(user_name="Ana"),
+    ]
+
+    valid, errors = validate_appointments_batch(payloads, now=NOW)
+
+    assert [row for row, _ in valid] == [0, 3]
+    assert [error["row"] for error in errors] == [1, 2]
+    assert errors[0]["errors"][0]["loc"] == ["user_name"]
+    json.dumps(errors)
+
+
+def test_batch_rejects_naive_now():
+    with pytest.raises(ValueError):
+        validate_appointments_batch([_payload()], now=datetime(2030, 1, 10, 12, 0))
+
+
+def test_single_model_matches_batch_rules():
+    with pytest.raises(ValueError):
+        AppointmentCreate(user_name="Juan!", appointment_time=datetime(2030, 1, 10, 15, 0, tzinfo=timezone.utc))
+
+
+def test_jsonl_remaps_rows_to_file_lines(tmp_path):
+    path = tmp_path / "appointments.jsonl"
+    path.write_text(
+        "\n".join([
+            json.dumps(_payload()),
+            "",
+            "{not json",
+            json.dumps(_payload(user_name="")),
+            json.dumps(_payload(user_name="Ana")),
+        ]) + "\n",
+        encoding="utf-8",
+    )
+
+    valid, errors = validate_appointments_jsonl(path, now=NOW)
+
+    assert [row for row, _ in valid] == [0, 4]
+    assert [error["row"] for error in errors] == [2, 3]
+    assert errors[0]["errors"][0]["type"] == "json_invalid"
+    json.dumps(errors)
+
+
+def test_batch_reports_non_object_rows():
+    valid, errors = validate_appointments_batch([_payload(), "no es un objeto"], now=NOW)
+
+    assert [row for row, _ in valid] == [0]
+    assert errors[0]["row"] == 1
+
+
+def test_jsonl_reports_non_utf8_lines(tmp_path):
+    path = tmp_path / "appointments.jsonl"
+    path.write_bytes(
+        json.dumps(_payload()).encode("utf-8") + b"\n"
+        + b'{"user_name": "Jos\xe9"}\n'
+        + json.dumps(_payload(user_name="Ana")).encode("utf-8") + b"\n"
+    )
+
+    valid, errors = validate_appointments_jsonl(path, now=NOW)
+
+    assert [row for row, _ in valid] == [0, 2]
+    assert errors[0]["row"] == 1
+    assert errors[0]["errors"][0]["type"] == "unicode_decode_error"